@@ -1,7 +1,14 @@
+import copy
 import csv
+import json
 import os
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson  # Optional: faster JSON encoder for the precomputed bodies
+except ImportError:
+    orjson = None
 
 """
 APIKeyManager: Handles API key validation using a CSV file for client data.
@@ -11,8 +18,18 @@ IMPORTANT NOTES FOR DEVELOPERS:
 - clients.csv must have headers: api_key,client_name,classification
 - API keys are sensitive data - avoid logging them
 - If clients.csv changes, server needs restart or call reload_clients()
+- validate_key returns shared, precomputed response dicts - callers must not mutate them
+- get_response() returns validate_key's result plus the key's serialized /data success
+  body; clients and bodies are replaced together (one assignment) on reload_clients()
+- Parsed CSV contents are cached by (path, mtime, size), so reloading an unchanged file skips parsing
 """
 
+# Parsed clients keyed by (absolute path, st_mtime_ns, st_size)
+_CSV_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+# Shared result for unknown keys (read-only)
+_INVALID_RESPONSE = {"valid": False, "error": {"message": "Invalid API Key"}}
+
 class APIKeyManager:
     def __init__(self, key_file: str = "clients.csv"):
         """
@@ -21,42 +38,98 @@ class APIKeyManager:
             key_file (str): Path to CSV file containing client data (relative to this file)
         """
         self.key_file = os.path.join(os.path.dirname(__file__), key_file)
-        self.clients = self._load_clients()
+        self._state = self._build_state(self._load_clients())
+
+    @property
+    def clients(self) -> Dict[str, Dict[str, Any]]:
+        """API key -> precomputed validate_key success response."""
+        return self._state[0]
+
+    @property
+    def responses(self) -> Dict[str, bytes]:
+        """API key -> serialized /data success body."""
+        return self._state[1]
 
-    def _load_clients(self) -> Dict[str, Dict[str, str]]:
+    def _load_clients(self) -> Dict[str, Dict[str, Any]]:
         """
         Load client data from CSV file into a dictionary.
         Returns:
-            Dict[str, Dict[str, str]]: Dictionary mapping API keys to client data
+            Dict[str, Dict[str, Any]]: Dictionary mapping API keys to their precomputed
+            validate_key success response ({"valid", "client_name", "classification"})
         """
-        clients: Dict[str, Dict[str, str]] = {}
+        clients: Dict[str, Dict[str, Any]] = {}
         try:
+            st = os.stat(self.key_file)
+            cache_key = (os.path.abspath(self.key_file), st.st_mtime_ns, st.st_size)
+            if cache_key in _CSV_CACHE:
+                return copy.deepcopy(_CSV_CACHE[cache_key])
+
             with open(self.key_file, mode='r') as file:
-                reader = csv.DictReader(file)
-                if not {'api_key', 'client_name', 'classification'}.issubset(reader.fieldnames or []):
+                # Plain csv.reader with header indices resolved once avoids a dict per row
+                reader = csv.reader(file)
+                header = next(reader, [])
+                if not {'api_key', 'client_name', 'classification'}.issubset(header):
                     logging.error("Required columns missing in clients.csv")
                     return clients
+                key_idx = header.index('api_key')
+                name_idx = header.index('client_name')
+                class_idx = header.index('classification')
+                width = len(header)
                 
                 for row in reader:
-                    api_key = row["api_key"]
-                    clients[api_key] = {
-                        "client_name": row["client_name"],
-                        "classification": row["classification"]
+                    if not row:
+                        continue  # Blank line (DictReader skipped these too)
+                    if len(row) < width:
+                        row.extend([None] * (width - len(row)))  # Same as DictReader's restval
+                    clients[row[key_idx]] = {
+                        "valid": True,
+                        "client_name": row[name_idx],
+                        "classification": row[class_idx]
                     }
+            # Keep only the latest parse per file
+            for stale_key in [k for k in _CSV_CACHE if k[0] == cache_key[0]]:
+                del _CSV_CACHE[stale_key]
+            _CSV_CACHE[cache_key] = copy.deepcopy(clients)
         except FileNotFoundError:
             logging.error("clients.csv not found - API validation will fail")
         except Exception as e:
             logging.error(f"Error reading clients.csv: {str(e)}")
         return clients
 
-    def validate_key(self, api_key: str) -> dict:
-        """Validate the provided API key."""
-        if api_key in self.clients:
-            client_data = self.clients[api_key]
-            return {
-                "valid": True,
-                "client_name": client_data["client_name"],
-                "classification": client_data["classification"]
+    @staticmethod
+    def _build_state(clients: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, bytes]]:
+        """
+        Serialize the /data success body for every API key once.
+        Returns:
+            Tuple: (clients, dictionary mapping API keys to JSON response bodies)
+        """
+        responses: Dict[str, bytes] = {}
+        for api_key, client in clients.items():
+            body = {
+                "message": f"Welcome {client['client_name']}",
+                "classification": client["classification"]
             }
-        else:
-            return {"valid": False, "error": {"message": "Invalid API Key"}}
+            if orjson is not None:
+                responses[api_key] = orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+            else:
+                responses[api_key] = json.dumps(body, sort_keys=True, separators=(",", ":")).encode()
+        return clients, responses
+
+    def reload_clients(self) -> None:
+        """Reload client data from the CSV file."""
+        # Single assignment: a concurrent request sees either the old or the new pair, never a mix
+        self._state = self._build_state(self._load_clients())
+
+    def validate_key(self, api_key: str) -> dict:
+        """Validate the provided API key. The returned dict is shared; do not mutate it."""
+        return self._state[0].get(api_key, _INVALID_RESPONSE)
+
+    def get_response(self, api_key: str) -> Tuple[dict, Optional[bytes]]:
+        """
+        Validate the provided API key and fetch its /data success body.
+        Both come from the same snapshot, so a concurrent reload_clients() can't mismatch them.
+        Returns:
+            Tuple[dict, Optional[bytes]]: (validate_key result, serialized body or None if invalid)
+        """
+        clients, responses = self._state
+        return clients.get(api_key, _INVALID_RESPONSE), responses.get(api_key)
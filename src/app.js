@@ -44,8 +44,9 @@ function extractClientIP(req) {
   // Check X-Forwarded-For header (for proxy/load balancer scenarios)
   const forwardedFor = req.headers['x-forwarded-for'];
   if (forwardedFor) {
-    // Take the first IP if multiple are present
-    return forwardedFor.split(',')[0].trim();
+    // Take the first IP if multiple are present (no split for the common single-IP case)
+    const comma = forwardedFor.indexOf(',');
+    return (comma === -1 ? forwardedFor : forwardedFor.slice(0, comma)).trim();
   }
 
   // Fall back to direct connection IP
@@ -1,8 +1,15 @@
 from flask import Flask, request, jsonify
 from api_key_manager import APIKeyManager
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+
+try:
+    import orjson  # Optional: faster C-implemented JSON encoder
+except ImportError:
+    orjson = None
 
 """
 API Rate Limiter Application
@@ -11,27 +18,101 @@ IMPORTANT NOTES FOR DEVELOPERS:
 - Configure logging here, not in imported modules
 - API keys should never be logged
 - Update clients.csv and restart server or call key_manager.reload_clients()
+- JSON responses use orjson when it is installed, otherwise Flask's default encoder
 - All responses follow the format: {"error": {"message": str}} for errors
                                  {"message": str, "classification": str} for success
 """
 
 app = Flask(__name__)
 
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class ORJSONProvider(JSONProvider):
+        """Flask JSON provider backed by orjson; used by every jsonify() call."""
+
+        def dumps(self, obj, **kwargs):
+            # Sorted keys to match Flask's default provider output
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Console output
-        logging.handlers.RotatingFileHandler(
+# Request threads only enqueue records (unbounded in-process queue, never blocks);
+# a background listener thread does the console/file writes (and, for the dev
+# server, log rotation), so slow log I/O never blocks a response.
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def build_log_handlers(rotate=True):
+    """
+    Create the console and api.log handlers used by the log listener.
+    With rotate=False api.log is opened with a WatchedFileHandler instead: for
+    multi-process servers, where rotation is left to an external tool such as
+    logrotate and each process reopens the file once it has been moved.
+    """
+    if rotate:
+        file_handler = logging.handlers.RotatingFileHandler(
             'api.log',  # Log file name
             maxBytes=1024*1024,   # 1MB
             backupCount=5         # Keep 5 backup files
         )
+    else:
+        file_handler = logging.handlers.WatchedFileHandler('api.log')
+    handlers = [
+        logging.StreamHandler(),  # Console output
+        file_handler
     ]
+    for handler in handlers:
+        handler.setFormatter(log_formatter)
+    return handlers
+
+log_queue_handler = logging.handlers.QueueHandler(None)  # Queue is set by start_log_listener()
+# Only merge args into the message here; log_formatter is applied once by the listener's handlers
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = None
+log_listener_pid = None
+
+def stop_log_listener():
+    """Flush queued records and close the handlers of the current listener, if any."""
+    global log_listener
+    if log_listener is None:
+        return
+    if log_listener_pid == os.getpid():
+        log_listener.stop()  # An inherited listener's thread didn't survive fork; nothing to stop
+    for handler in log_listener.handlers:
+        handler.close()
+    log_listener = None
+
+def start_log_listener(rotate=True):
+    """
+    Start the background log writer thread for the current process.
+    Threads don't survive fork, so Gunicorn calls this again in each worker
+    (post_worker_init, with rotate=False - see gunicorn.conf.py).
+    """
+    global log_listener, log_listener_pid
+    stop_log_listener()
+    log_queue = queue.Queue(-1)  # Unbounded; fresh per process
+    log_queue_handler.queue = log_queue
+    log_listener = logging.handlers.QueueListener(log_queue, *build_log_handlers(rotate), respect_handler_level=True)
+    log_listener_pid = os.getpid()
+    log_listener.start()
+
+start_log_listener()
+atexit.register(stop_log_listener)
+
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[log_queue_handler]
 )
 
+logger = logging.getLogger(__name__)
+
 # Initialize API key manager
+# Built once at import: with Gunicorn's preload_app the parsed clients are shared
+# copy-on-write by all workers instead of being loaded per worker
 key_manager = APIKeyManager()
 
 @app.route("/data", methods=["GET"])
@@ -40,20 +121,20 @@ def get_data():
     api_key = request.headers.get("x-api-key")
 
     if not api_key:
-        logging.warning("Request received without API key")
+        logger.warning("Request received without API key")
         return jsonify({"error": {"message": "API key missing"}}), 400
 
-    result = key_manager.validate_key(api_key)
+    result, body = key_manager.get_response(api_key)  # Shared dict - read only
 
     if not result["valid"]:
-        logging.info("Invalid API key attempt")  # Don't log the actual key
+        logger.info("Invalid API key attempt")  # Don't log the actual key
         return jsonify(result), 401  # Unauthorized
 
-    logging.info(f"Successful request for client: {result['client_name']}")
-    return jsonify({
-        "message": f"Welcome {result['client_name']}",
-        "classification": result["classification"]
-    }), 200
+    # Lazy %-formatting: the message is only built if INFO is enabled
+    logger.info("Successful request for client: %s", result['client_name'])
+    # Body was serialized once at load time - no dict building or jsonify per request
+    return body, 200, {"Content-Type": "application/json"}
 
 if __name__ == "__main__":
+    # Development server only - production runs wsgi.py under Gunicorn (see gunicorn.conf.py)
     app.run(debug=True)
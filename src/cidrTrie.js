@@ -0,0 +1,418 @@
+/**
+ * CIDRTrie: Longest-prefix matching of IP addresses against CIDR ranges
+ *
+ * - Multibit trie with an 8-bit stride: at most 4 levels for IPv4, 16 for IPv6
+ * - Nodes only hold the slots in use, so sparse (deep IPv6) levels stay small
+ * - Prefixes that don't end on a byte boundary are expanded across slots (leaf pushing)
+ * - Separate roots for IPv4 and IPv6 (an address only matches its own family)
+ * - Lookup cost is bounded by the address length, not the number of ranges
+ * - When ranges overlap, the most specific (longest) prefix wins
+ * - Recent lookup results are kept in a bounded LRU cache, dropped on any change
+ */
+
+const ADDRESS_BITS = { 4: 32, 6: 128 };
+
+// Parsed CIDR strings are memoized: the same ranges recur across reloads and lists
+const CIDR_CACHE_SIZE = 8192;
+const cidrCache = new Map();
+
+// Recently parsed IPv6 addresses (string -> frozen {version, value}), in LRU order;
+// IPv6 parsing and BigInt construction cost far more than the IPv4 fast path
+const ADDRESS_CACHE_SIZE = 2048;
+const addressCache = new Map();
+
+/**
+ * Parse a dotted-quad IPv4 address into a uint32 in a single pass over its
+ * characters (no split/regex allocations on the per-request path)
+ * @private
+ * @param {string} address - IPv4 address
+ * @returns {number} Address as an unsigned 32-bit integer, or -1 if invalid
+ */
+function parseIPv4Integer(address) {
+  let value = 0;
+  let octet = 0;
+  let digits = 0;
+  let dots = 0;
+
+  for (let i = 0; i < address.length; i++) {
+    const code = address.charCodeAt(i);
+    if (code >= 48 && code <= 57) {
+      octet = octet * 10 + (code - 48);
+      digits += 1;
+      if (digits > 3 || octet > 255) return -1;
+    } else if (code === 46) {
+      if (digits === 0 || dots === 3) return -1;
+      value = value * 256 + octet;
+      octet = 0;
+      digits = 0;
+      dots += 1;
+    } else {
+      return -1;
+    }
+  }
+
+  if (digits === 0 || dots !== 3) return -1;
+  return value * 256 + octet;
+}
+
+/**
+ * Parse a dotted-quad IPv4 address into bytes
+ * @private
+ * @param {string} address - IPv4 address
+ * @returns {Uint8Array|null} 4 bytes, or null if invalid
+ */
+function parseIPv4(address) {
+  const value = parseIPv4Integer(address);
+  if (value === -1) return null;
+  return new Uint8Array([value >>> 24, (value >>> 16) & 0xff, (value >>> 8) & 0xff, value & 0xff]);
+}
+
+/**
+ * Parse an IPv6 address (including '::' and embedded IPv4 forms) into bytes
+ * @private
+ * @param {string} address - IPv6 address, optionally with a %zone suffix
+ * @returns {Uint8Array|null} 16 bytes, or null if invalid
+ */
+function parseIPv6(address) {
+  const zoneIndex = address.indexOf('%');
+  if (zoneIndex !== -1) address = address.slice(0, zoneIndex);
+
+  const halves = address.split('::');
+  if (halves.length > 2) return null;
+
+  const toGroups = (part) => (part === '' ? [] : part.split(':'));
+  const head = toGroups(halves[0]);
+  const tail = halves.length === 2 ? toGroups(halves[1]) : [];
+
+  // An embedded IPv4 address occupies the last two 16-bit groups
+  const groups = halves.length === 2 ? tail : head;
+  let ipv4Tail = null;
+  if (groups.length > 0 && groups[groups.length - 1].includes('.')) {
+    ipv4Tail = parseIPv4(groups.pop());
+    if (!ipv4Tail) return null;
+  }
+
+  const groupCount = head.length + tail.length + (ipv4Tail ? 2 : 0);
+  if (halves.length === 2 ? groupCount > 7 : groupCount !== 8) return null;
+
+  const bytes = new Uint8Array(16);
+  const writeGroups = (list, offset) => {
+    for (let i = 0; i < list.length; i++) {
+      if (!/^[0-9a-fA-F]{1,4}$/.test(list[i])) return false;
+      const value = parseInt(list[i], 16);
+      bytes[offset + i * 2] = value >> 8;
+      bytes[offset + i * 2 + 1] = value & 0xff;
+    }
+    return true;
+  };
+
+  if (!writeGroups(head, 0)) return null;
+  const tailBytes = tail.length * 2 + (ipv4Tail ? 4 : 0);
+  if (halves.length === 2 && !writeGroups(tail, 16 - tailBytes)) return null;
+  if (ipv4Tail) bytes.set(ipv4Tail, 12);
+
+  return bytes;
+}
+
+/**
+ * Parse an IP address string
+ * @param {string} address - IPv4 or IPv6 address
+ * @returns {{version: number, bytes: Uint8Array}|null} Parsed address, or null if invalid
+ */
+export function parseIP(address) {
+  if (typeof address !== 'string' || address.length === 0) return null;
+
+  if (address.includes(':')) {
+    const bytes = parseIPv6(address);
+    return bytes ? { version: 6, bytes } : null;
+  }
+
+  const bytes = parseIPv4(address);
+  return bytes ? { version: 4, bytes } : null;
+}
+
+/**
+ * Parse a CIDR range string; host bits are cleared (non-strict parsing)
+ * @param {string} cidr - CIDR range, e.g. '10.0.0.0/8' or '2001:db8::/32'
+ * @returns {{version: number, bytes: Uint8Array, prefixLength: number}|null} Parsed range, or null if invalid
+ */
+export function parseCIDR(cidr) {
+  if (typeof cidr !== 'string') return null;
+
+  const slash = cidr.indexOf('/');
+  if (slash === -1) return null;
+
+  const prefix = cidr.slice(slash + 1);
+  const parsed = parseIP(cidr.slice(0, slash));
+  if (!parsed || !/^\d{1,3}$/.test(prefix)) return null;
+
+  const prefixLength = Number(prefix);
+  if (prefixLength > ADDRESS_BITS[parsed.version]) return null;
+
+  const { bytes } = parsed;
+  for (let i = prefixLength; i < bytes.length * 8; i++) {
+    bytes[i >> 3] &= ~(0x80 >> (i & 7));
+  }
+
+  return { version: parsed.version, bytes, prefixLength };
+}
+
+/**
+ * Memoized parse of a CIDR string, shared by cidrToInteger() and CIDRTrie.insert()
+ * Cached results are read-only; callers must not mutate them.
+ * @private
+ * @param {string} cidr - CIDR range
+ * @returns {{range: Object|null, integer: Object|null|undefined}} Cache entry
+ */
+function getCachedCIDR(cidr) {
+  let entry = cidrCache.get(cidr);
+  if (entry) return entry;
+
+  entry = { range: parseCIDR(cidr), integer: undefined };
+  if (cidrCache.size >= CIDR_CACHE_SIZE) {
+    cidrCache.delete(cidrCache.keys().next().value);
+  }
+  cidrCache.set(cidr, entry);
+  return entry;
+}
+
+/**
+ * Convert address bytes to an integer: a uint32 Number for IPv4, a BigInt for IPv6
+ * @private
+ */
+function bytesToInteger(bytes) {
+  if (bytes.length === 4) {
+    return ((bytes[0] << 24) | (bytes[1] << 16) | (bytes[2] << 8) | bytes[3]) >>> 0;
+  }
+  let value = 0n;
+  for (const byte of bytes) {
+    value = (value << 8n) | BigInt(byte);
+  }
+  return value;
+}
+
+/**
+ * Parse an IP address into its integer form (IPv6 results are memoized)
+ * @param {string} address - IPv4 or IPv6 address
+ * @returns {{version: number, value: number|bigint}|null} Parsed address, or null if invalid
+ */
+export function addressToInteger(address) {
+  if (typeof address === 'string' && !address.includes(':')) {
+    const value = parseIPv4Integer(address);
+    return value === -1 ? null : { version: 4, value };
+  }
+
+  if (addressCache.has(address)) {
+    const cached = addressCache.get(address);
+    addressCache.delete(address);
+    addressCache.set(address, cached);
+    return cached;
+  }
+
+  const parsed = parseIP(address);
+  const result = parsed ? Object.freeze({ version: parsed.version, value: bytesToInteger(parsed.bytes) }) : null;
+
+  if (typeof address === 'string') {
+    if (addressCache.size >= ADDRESS_CACHE_SIZE) {
+      addressCache.delete(addressCache.keys().next().value);
+    }
+    addressCache.set(address, result);
+  }
+
+  return result;
+}
+
+/**
+ * Parse a CIDR range into integer network and netmask values
+ * @param {string} cidr - CIDR range
+ * @returns {{version: number, network: number|bigint, mask: number|bigint}|null} Frozen (memoized) range, or null if invalid
+ */
+export function cidrToInteger(cidr) {
+  const entry = getCachedCIDR(cidr);
+  if (entry.integer !== undefined) return entry.integer;
+
+  const { range } = entry;
+  if (!range) {
+    entry.integer = null;
+    return null;
+  }
+
+  const { version, prefixLength } = range;
+  let mask;
+  if (version === 4) {
+    mask = prefixLength === 0 ? 0 : (0xffffffff << (32 - prefixLength)) >>> 0;
+  } else {
+    mask = ((1n << BigInt(prefixLength)) - 1n) << BigInt(128 - prefixLength);
+  }
+
+  entry.integer = Object.freeze({ version, network: bytesToInteger(range.bytes), mask });
+  return entry.integer;
+}
+
+/**
+ * Check whether an integer address (from addressToInteger) lies in an integer range (from cidrToInteger)
+ * @param {{version: number, value: number|bigint}} address - Parsed address
+ * @param {{version: number, network: number|bigint, mask: number|bigint}} range - Parsed range
+ * @returns {boolean} True if the address is inside the range
+ */
+export function integerInRange(address, range) {
+  if (address.version !== range.version) return false;
+  if (address.version === 4) {
+    return ((address.value & range.mask) >>> 0) === range.network;
+  }
+  return (address.value & range.mask) === range.network;
+}
+
+/**
+ * Create a multibit trie node: Map<byte, slot> for the values of the next
+ * byte that are in use (allocated on demand rather than as 256 dense slots).
+ * Each slot holds the value of the longest range expanded into it (and that
+ * range's prefix length), plus an optional child node for the following byte.
+ * @private
+ */
+function createNode() {
+  return new Map();
+}
+
+/**
+ * Get the slot for a byte in a node, creating it if needed
+ * @private
+ */
+function getSlot(node, byte) {
+  let slot = node.get(byte);
+  if (!slot) {
+    slot = { value: undefined, length: 0, child: null };
+    node.set(byte, slot);
+  }
+  return slot;
+}
+
+class CIDRTrie {
+  /**
+   * Create an empty trie
+   * @param {Object} options - Trie options
+   * @param {number} options.cacheSize - Max cached lookup results (0 disables caching)
+   */
+  constructor(options = {}) {
+    this.cacheSize = options.cacheSize ?? 4096;
+
+    // Map<address_string, value> in least- to most-recently-used order
+    this.cache = new Map();
+
+    this.clear();
+  }
+
+  /**
+   * Remove all ranges from the trie
+   */
+  clear() {
+    this.roots = { 4: createNode(), 6: createNode() };
+
+    // Values of /0 ranges, which cover every address of the family
+    this.defaults = { 4: undefined, 6: undefined };
+
+    // Distinct ranges inserted, as 'version:network/prefix'
+    this.ranges = new Set();
+
+    this.size = 0;
+    this.cache.clear();
+  }
+
+  /**
+   * Insert a CIDR range; an existing identical range has its value replaced
+   * @param {string} cidr - CIDR range
+   * @param {*} value - Value returned by lookup() for addresses in this range
+   * @returns {boolean} True if the range was valid and inserted
+   */
+  insert(cidr, value) {
+    const { range } = getCachedCIDR(cidr);
+    if (!range) return false;
+
+    this.cache.clear();
+
+    const { version, bytes, prefixLength } = range;
+    this.ranges.add(`${version}:${bytes.join('.')}/${prefixLength}`);
+    this.size = this.ranges.size;
+
+    if (prefixLength === 0) {
+      this.defaults[version] = value;
+      return true;
+    }
+
+    // Walk whole bytes of the prefix, creating child nodes as needed
+    let node = this.roots[version];
+    const lastLevel = (prefixLength - 1) >> 3;
+    for (let level = 0; level < lastLevel; level++) {
+      const slot = getSlot(node, bytes[level]);
+      if (!slot.child) slot.child = createNode();
+      node = slot.child;
+    }
+
+    // Expand the remaining bits across every slot they cover (leaf pushing);
+    // a slot keeps the value of the longest range that reaches it
+    const freeBits = (lastLevel + 1) * 8 - prefixLength;
+    const first = bytes[lastLevel];
+    const last = first + (1 << freeBits) - 1;
+    for (let byte = first; byte <= last; byte++) {
+      const slot = getSlot(node, byte);
+      if (slot.length <= prefixLength) {
+        slot.value = value;
+        slot.length = prefixLength;
+      }
+    }
+
+    return true;
+  }
+
+  /**
+   * Find the value of the longest CIDR range containing an address
+   * @param {string} address - IPv4 or IPv6 address
+   * @returns {*} Stored value, or undefined if no range matches
+   */
+  lookup(address) {
+    if (this.cache.has(address)) {
+      // Re-insert to mark as most recently used
+      const cached = this.cache.get(address);
+      this.cache.delete(address);
+      this.cache.set(address, cached);
+      return cached;
+    }
+
+    const value = this._walk(address);
+
+    if (this.cacheSize > 0) {
+      if (this.cache.size >= this.cacheSize) {
+        this.cache.delete(this.cache.keys().next().value);
+      }
+      this.cache.set(address, value);
+    }
+
+    return value;
+  }
+
+  /**
+   * Walk the trie one byte per level, remembering the deepest slot with a value
+   * @private
+   * @param {string} address - IPv4 or IPv6 address
+   * @returns {*} Stored value, or undefined if no range matches
+   */
+  _walk(address) {
+    const parsed = parseIP(address);
+    if (!parsed) return undefined;
+
+    const { version, bytes } = parsed;
+    let node = this.roots[version];
+    let best = this.defaults[version];
+
+    for (let level = 0; node && level < bytes.length; level++) {
+      const slot = node.get(bytes[level]);
+      if (!slot) break;
+      if (slot.value !== undefined) best = slot.value;
+      node = slot.child;
+    }
+
+    return best;
+  }
+}
+
+export default CIDRTrie;
@@ -0,0 +1,39 @@
+import gc
+import multiprocessing
+
+"""
+Gunicorn configuration for the API (see wsgi.py).
+
+IMPORTANT NOTES FOR DEVELOPERS:
+- gevent workers need the gevent package installed alongside gunicorn
+- preload_app imports app.py once in the master, so the APIKeyManager and its
+  parsed data are shared copy-on-write by all workers instead of duplicated
+- Each process logs through its own in-process queue and listener thread (threads
+  don't survive fork), started in post_worker_init once gevent has patched the worker
+- Under Gunicorn no process rotates api.log: every process appends to it with a
+  WatchedFileHandler, so rotate it externally (e.g. logrotate) and they reopen it
+"""
+
+wsgi_app = "wsgi:application"
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count()
+worker_class = "gevent"
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Exclude everything loaded so far from garbage collection so collections in
+    # workers don't write to (and un-share) those pages
+    gc.freeze()
+
+
+def on_starting(server):
+    # The master imported app.py (preload) with the dev-server RotatingFileHandler;
+    # switch it to the shared, externally rotated setup before any worker exists
+    from app import start_log_listener
+    start_log_listener(rotate=False)
+
+
+def post_worker_init(worker):
+    from app import start_log_listener
+    start_log_listener(rotate=False)
@@ -6,7 +6,7 @@
  * - Blocklist: IPs that are immediately rejected with HTTP 403
  * - Supports both individual IP addresses and CIDR ranges
  * - IPv4 and IPv6 support
- * - Fast lookup using Map data structures
+ * - Fast lookup using Map data structures and a CIDR trie (longest prefix wins)
  * - Persistent storage in CSV files
  */
 
@@ -16,10 +16,35 @@ import { parse } from 'csv-parse/sync';
 import { stringify } from 'csv-stringify/sync';
 import { fileURLToPath } from 'url';
 import CIDR from 'ip-cidr';
+import CIDRTrie from './cidrTrie.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
+/**
+ * Parse a list entry as a CIDR range
+ * Entries without a '/' are individual IPs and skip ip-cidr's throw/catch path entirely
+ * @param {string} ipOrCidr - IP address or CIDR range
+ * @returns {CIDR|null} Parsed CIDR, or null if the entry is an individual IP
+ */
+function parseCIDREntry(ipOrCidr) {
+  if (!ipOrCidr.includes('/')) return null;
+  try {
+    return new CIDR(ipOrCidr);
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Prefix length of a CIDR list key
+ * @param {string} ipOrCidr - CIDR range
+ * @returns {number} Prefix length (0 if it can't be read)
+ */
+function cidrPrefixLength(ipOrCidr) {
+  return parseInt(ipOrCidr.slice(ipOrCidr.lastIndexOf('/') + 1), 10) || 0;
+}
+
 export const IPListAction = {
   ALLOW: 'allow',
   BLOCK: 'block',
@@ -39,6 +64,14 @@ class IPAllowBlockManager {
     // Map<ip_or_cidr, {type: 'ip'|'cidr', cidrObj?, description, addedDate, requestCount}>
     this.allowlist = new Map();
     this.blocklist = new Map();
+
+    // CIDR entries indexed by prefix; values are the ip_or_cidr keys above
+    this.allowlistTrie = new CIDRTrie();
+    this.blocklistTrie = new CIDRTrie();
+
+    // CIDR keys ip-cidr accepts but the trie can't parse; matched with cidrObj.contains()
+    this.allowlistUnindexed = new Set();
+    this.blocklistUnindexed = new Set();
     
     this._loadAllowlist();
     this._loadBlocklist();
@@ -64,6 +97,8 @@ class IPAllowBlockManager {
       });
 
       this.allowlist.clear();
+      this.allowlistTrie.clear();
+      this.allowlistUnindexed.clear();
 
       for (const row of records) {
         const ipOrCidr = row.ip_or_cidr?.trim();
@@ -73,9 +108,8 @@ class IPAllowBlockManager {
 
         if (!ipOrCidr) continue;
 
-        try {
-          // Try to parse as CIDR range
-          const cidrObj = new CIDR(ipOrCidr);
+        const cidrObj = parseCIDREntry(ipOrCidr);
+        if (cidrObj) {
           this.allowlist.set(ipOrCidr, {
             type: 'cidr',
             cidrObj: cidrObj,
@@ -83,7 +117,8 @@ class IPAllowBlockManager {
             addedDate: addedDate,
             requestCount: requestCount
           });
-        } catch (error) {
+          this._indexCIDR(ipOrCidr, this.allowlistTrie, this.allowlistUnindexed);
+        } else {
           // Not a valid CIDR, treat as individual IP
           this.allowlist.set(ipOrCidr, {
             type: 'ip',
@@ -120,6 +155,8 @@ class IPAllowBlockManager {
       });
 
       this.blocklist.clear();
+      this.blocklistTrie.clear();
+      this.blocklistUnindexed.clear();
 
       for (const row of records) {
         const ipOrCidr = row.ip_or_cidr?.trim();
@@ -129,9 +166,8 @@ class IPAllowBlockManager {
 
         if (!ipOrCidr) continue;
 
-        try {
-          // Try to parse as CIDR range
-          const cidrObj = new CIDR(ipOrCidr);
+        const cidrObj = parseCIDREntry(ipOrCidr);
+        if (cidrObj) {
           this.blocklist.set(ipOrCidr, {
             type: 'cidr',
             cidrObj: cidrObj,
@@ -139,7 +175,8 @@ class IPAllowBlockManager {
             addedDate: addedDate,
             requestCount: requestCount
           });
-        } catch (error) {
+          this._indexCIDR(ipOrCidr, this.blocklistTrie, this.blocklistUnindexed);
+        } else {
           // Not a valid CIDR, treat as individual IP
           this.blocklist.set(ipOrCidr, {
             type: 'ip',
@@ -156,6 +193,65 @@ class IPAllowBlockManager {
     }
   }
 
+  /**
+   * Index a CIDR entry for lookup
+   * Ranges ip-cidr accepted but the trie rejects are kept for cidrObj.contains() matching,
+   * so they still match instead of being silently skipped
+   * @private
+   * @param {string} ipOrCidr - CIDR range (list key)
+   * @param {CIDRTrie} trie - Trie of the list
+   * @param {Set<string>} unindexed - CIDR keys of the list not in the trie
+   */
+  _indexCIDR(ipOrCidr, trie, unindexed) {
+    if (!trie.insert(ipOrCidr, ipOrCidr)) {
+      console.warn(`CIDR range not supported by trie lookup, using linear match: ${ipOrCidr}`);
+      unindexed.add(ipOrCidr);
+    }
+  }
+
+  /**
+   * Find the list key of the most specific CIDR range containing an IP address,
+   * across the trie and any unindexed ranges
+   * @private
+   * @param {string} ipAddress - IP address to check
+   * @param {Map} list - Allowlist or blocklist map
+   * @param {CIDRTrie} trie - Trie of the list
+   * @param {Set<string>} unindexed - CIDR keys of the list not in the trie
+   * @returns {string|undefined} Matching ip_or_cidr key, or undefined if none
+   */
+  _matchCIDR(ipAddress, list, trie, unindexed) {
+    let matchedCidr = trie.lookup(ipAddress);
+    if (unindexed.size === 0) return matchedCidr;
+
+    // Longest prefix wins, whichever source the range is in
+    let matchedLength = matchedCidr === undefined ? -1 : cidrPrefixLength(matchedCidr);
+    for (const ipOrCidr of unindexed) {
+      const prefixLength = cidrPrefixLength(ipOrCidr);
+      if (prefixLength > matchedLength && list.get(ipOrCidr).cidrObj.contains(ipAddress)) {
+        matchedCidr = ipOrCidr;
+        matchedLength = prefixLength;
+      }
+    }
+    return matchedCidr;
+  }
+
+  /**
+   * Rebuild a CIDR trie from the CIDR entries of a list
+   * @private
+   * @param {Map} list - Allowlist or blocklist map
+   * @param {CIDRTrie} trie - Trie to repopulate
+   * @param {Set<string>} unindexed - CIDR keys the trie rejects, repopulated alongside
+   */
+  _rebuildTrie(list, trie, unindexed) {
+    trie.clear();
+    unindexed.clear();
+    for (const [ipOrCidr, entry] of list.entries()) {
+      if (entry.type === 'cidr') {
+        this._indexCIDR(ipOrCidr, trie, unindexed);
+      }
+    }
+  }
+
   /**
    * Create allowlist CSV file with headers
    * @private
@@ -262,13 +358,13 @@ class IPAllowBlockManager {
       return true;
     }
 
-    // Check CIDR ranges
-    for (const [, entry] of this.allowlist.entries()) {
-      if (entry.type === 'cidr' && entry.cidrObj.contains(ipAddress)) {
-        entry.requestCount += 1;
-        this._saveAllowlist();
-        return true;
-      }
+    // Check CIDR ranges (most specific matching range)
+    const matchedCidr = this._matchCIDR(ipAddress, this.allowlist, this.allowlistTrie, this.allowlistUnindexed);
+    if (matchedCidr !== undefined) {
+      const entry = this.allowlist.get(matchedCidr);
+      entry.requestCount += 1;
+      this._saveAllowlist();
+      return true;
     }
 
     return false;
@@ -290,13 +386,13 @@ class IPAllowBlockManager {
       return true;
     }
 
-    // Check CIDR ranges
-    for (const [, entry] of this.blocklist.entries()) {
-      if (entry.type === 'cidr' && entry.cidrObj.contains(ipAddress)) {
-        entry.requestCount += 1;
-        this._saveBlocklist();
-        return true;
-      }
+    // Check CIDR ranges (most specific matching range)
+    const matchedCidr = this._matchCIDR(ipAddress, this.blocklist, this.blocklistTrie, this.blocklistUnindexed);
+    if (matchedCidr !== undefined) {
+      const entry = this.blocklist.get(matchedCidr);
+      entry.requestCount += 1;
+      this._saveBlocklist();
+      return true;
     }
 
     return false;
@@ -353,9 +449,8 @@ class IPAllowBlockManager {
 
     try {
       let entry;
-      try {
-        // Try to parse as CIDR
-        const cidrObj = new CIDR(ipOrCidr);
+      const cidrObj = parseCIDREntry(ipOrCidr);
+      if (cidrObj) {
         entry = {
           type: 'cidr',
           cidrObj: cidrObj,
@@ -363,7 +458,7 @@ class IPAllowBlockManager {
           addedDate: new Date().toISOString(),
           requestCount: 0
         };
-      } catch (error) {
+      } else {
         // Treat as individual IP
         entry = {
           type: 'ip',
@@ -374,6 +469,9 @@ class IPAllowBlockManager {
       }
 
       this.allowlist.set(ipOrCidr, entry);
+      if (entry.type === 'cidr') {
+        this._indexCIDR(ipOrCidr, this.allowlistTrie, this.allowlistUnindexed);
+      }
       this._saveAllowlist();
       console.info(`Added ${ipOrCidr} to allowlist: ${description}`);
       return true;
@@ -394,9 +492,8 @@ class IPAllowBlockManager {
 
     try {
       let entry;
-      try {
-        // Try to parse as CIDR
-        const cidrObj = new CIDR(ipOrCidr);
+      const cidrObj = parseCIDREntry(ipOrCidr);
+      if (cidrObj) {
         entry = {
           type: 'cidr',
           cidrObj: cidrObj,
@@ -404,7 +501,7 @@ class IPAllowBlockManager {
           addedDate: new Date().toISOString(),
           requestCount: 0
         };
-      } catch (error) {
+      } else {
         // Treat as individual IP
         entry = {
           type: 'ip',
@@ -415,6 +512,9 @@ class IPAllowBlockManager {
       }
 
       this.blocklist.set(ipOrCidr, entry);
+      if (entry.type === 'cidr') {
+        this._indexCIDR(ipOrCidr, this.blocklistTrie, this.blocklistUnindexed);
+      }
       this._saveBlocklist();
       console.info(`Added ${ipOrCidr} to blocklist: ${description}`);
       return true;
@@ -431,7 +531,11 @@ class IPAllowBlockManager {
    */
   removeFromAllowlist(ipOrCidr) {
     if (this.allowlist.has(ipOrCidr)) {
+      const entry = this.allowlist.get(ipOrCidr);
       this.allowlist.delete(ipOrCidr);
+      if (entry.type === 'cidr') {
+        this._rebuildTrie(this.allowlist, this.allowlistTrie, this.allowlistUnindexed);
+      }
       this._saveAllowlist();
       console.info(`Removed ${ipOrCidr} from allowlist`);
       return true;
@@ -446,7 +550,11 @@ class IPAllowBlockManager {
    */
   removeFromBlocklist(ipOrCidr) {
     if (this.blocklist.has(ipOrCidr)) {
+      const entry = this.blocklist.get(ipOrCidr);
       this.blocklist.delete(ipOrCidr);
+      if (entry.type === 'cidr') {
+        this._rebuildTrie(this.blocklist, this.blocklistTrie, this.blocklistUnindexed);
+      }
       this._saveBlocklist();
       console.info(`Removed ${ipOrCidr} from blocklist`);
       return true;
@@ -13,6 +13,7 @@ import { parse } from 'csv-parse/sync';
 import { stringify } from 'csv-stringify/sync';
 import { fileURLToPath } from 'url';
 import CIDR from 'ip-cidr';
+import { addressToInteger, cidrToInteger, integerInRange } from './cidrTrie.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -27,8 +28,12 @@ class IPManager {
     this.cidrFile = path.join(__dirname, cidrFile);
     this.learnedIpsFile = path.join(__dirname, learnedIpsFile);
     
-    // Map<client_name, Array<{cidr, cidrObj, requestCount}>>
+    // Map<client_name, Array<{cidr, cidrObj, range, requestCount}>>
+    // range holds the precomputed integer network/netmask used for matching
     this.cidrRanges = new Map();
+
+    // Map<client_name, {4: Array, 6: Array}> - same entries as cidrRanges, split by IP version
+    this.cidrRangesByVersion = new Map();
     
     // Map<ip, {clientName, firstSeen, lastSeen, requestCount}>
     this.learnedIps = new Map();
@@ -56,6 +61,10 @@ class IPManager {
       });
 
       this.cidrRanges.clear();
+      this.cidrRangesByVersion.clear();
+
+      // Malformed ranges are filtered up front and reported in one log line
+      const invalidRanges = [];
 
       for (const row of records) {
         const clientName = row.client_name?.trim();
@@ -64,23 +73,38 @@ class IPManager {
 
         if (!clientName || !cidrRange) continue;
 
+        const range = cidrToInteger(cidrRange);
+        if (!range) {
+          invalidRanges.push(cidrRange);
+          continue;
+        }
+
         try {
           const cidrObj = new CIDR(cidrRange);
           
           if (!this.cidrRanges.has(clientName)) {
             this.cidrRanges.set(clientName, []);
+            this.cidrRangesByVersion.set(clientName, { 4: [], 6: [] });
           }
 
-          this.cidrRanges.get(clientName).push({
+          const entry = {
             cidr: cidrRange,
             cidrObj: cidrObj,
+            range: range,
             requestCount: requestCount
-          });
+          };
+
+          this.cidrRanges.get(clientName).push(entry);
+          this.cidrRangesByVersion.get(clientName)[range.version].push(entry);
         } catch (error) {
           console.error(`Invalid CIDR range ${cidrRange}: ${error.message}`);
         }
       }
 
+      if (invalidRanges.length > 0) {
+        console.error(`Skipped ${invalidRanges.length} invalid CIDR range(s): ${invalidRanges.join(', ')}`);
+      }
+
       console.info(`Loaded ${records.length} CIDR ranges for ${this.cidrRanges.size} clients`);
     } catch (error) {
       console.error(`Error reading CIDR file: ${error.message}`);
@@ -230,11 +254,14 @@ class IPManager {
     }
 
     // Step 1: Check if IP is in preconfigured CIDR range
-    if (this.cidrRanges.has(clientName)) {
-      const ranges = this.cidrRanges.get(clientName);
+    // (address is parsed once, then matched with integer mask comparisons
+    // against only the ranges of the same IP version)
+    const address = addressToInteger(ipAddress);
+    if (address && this.cidrRangesByVersion.has(clientName)) {
+      const ranges = this.cidrRangesByVersion.get(clientName)[address.version];
       
       for (const range of ranges) {
-        if (range.cidrObj.contains(ipAddress)) {
+        if (integerInRange(address, range.range)) {
           // IP is in CIDR range - increment count
           range.requestCount += 1;
           console.info(`✓ IP ${ipAddress} matches CIDR ${range.cidr} for ${clientName} (count: ${range.requestCount})`);
@@ -0,0 +1,11 @@
+from app import app as application
+
+"""
+WSGI entry point for running the API under a production server.
+
+IMPORTANT NOTES FOR DEVELOPERS:
+- Run from this directory: gunicorn -c gunicorn.conf.py
+  (equivalent to: gunicorn -k gevent -w $(nproc) -b 0.0.0.0:5000 wsgi:application)
+- app.run() in app.py is the single-threaded development server - don't use it in production
+- The app is preloaded in the Gunicorn master and shared by forked workers (see gunicorn.conf.py)
+"""
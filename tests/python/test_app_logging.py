@@ -0,0 +1,74 @@
+"""
+Smoke tests for the queue-based logging in app.py
+
+Tests cover:
+- Records logged through log_queue_handler reach api.log once formatted (single prefix)
+- Stopping the listener flushes queued records
+- Restarting the listener for multi-process servers (rotate=False)
+
+Run from the repository root: python -m unittest discover -s tests/python
+"""
+
+import importlib
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+
+try:
+    import flask  # noqa: F401
+except ImportError:
+    flask = None
+
+
+@unittest.skipIf(flask is None, "Flask is not installed")
+class AppLoggingTest(unittest.TestCase):
+    def setUp(self):
+        # app.py opens api.log relative to the working directory
+        self.original_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+        sys.path.insert(0, os.path.abspath(SRC_DIR))
+        self.app = importlib.import_module("app")
+        self.app.start_log_listener()  # Fresh listener writing to this directory
+
+    def tearDown(self):
+        self.app.stop_log_listener()
+        sys.path.remove(os.path.abspath(SRC_DIR))
+        os.chdir(self.original_cwd)
+        self.tmp_dir.cleanup()
+
+    def read_log(self):
+        with open(os.path.join(self.tmp_dir.name, "api.log")) as file:
+            return file.read().splitlines()
+
+    def test_logs_through_queue_listener(self):
+        self.assertIn(self.app.log_queue_handler, logging.getLogger().handlers)
+
+        logging.getLogger("app").info("Successful request for client: %s", "Alice")
+        self.app.stop_log_listener()
+
+        self.assertIsNone(self.app.log_listener)
+        lines = self.read_log()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith(" - app - INFO - Successful request for client: Alice"))
+
+    def test_restart_without_rotation(self):
+        self.app.start_log_listener(rotate=False)
+
+        handlers = self.app.log_listener.handlers
+        self.assertTrue(any(isinstance(h, logging.handlers.WatchedFileHandler) for h in handlers))
+        self.assertFalse(any(isinstance(h, logging.handlers.RotatingFileHandler) for h in handlers))
+
+        logging.getLogger("app").warning("Request received without API key")
+        self.app.stop_log_listener()
+
+        self.assertTrue(self.read_log()[-1].endswith(" - app - WARNING - Request received without API key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
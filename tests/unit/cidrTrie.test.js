@@ -0,0 +1,190 @@
+/**
+ * Unit tests for CIDRTrie
+ *
+ * Tests cover:
+ * - IPv4 and IPv6 address / CIDR parsing
+ * - Integer network/netmask matching
+ * - Longest-prefix matching across overlapping ranges
+ * - Family separation (IPv4 ranges never match IPv6 addresses)
+ * - Invalid input handling
+ * - Lookup result caching and invalidation
+ */
+
+import { describe, test, expect, beforeEach } from '@jest/globals';
+import CIDRTrie, { parseIP, parseCIDR, addressToInteger, cidrToInteger, integerInRange } from '../../src/cidrTrie.js';
+
+describe('parseIP', () => {
+  test('should parse IPv4 addresses', () => {
+    expect(parseIP('192.168.1.10')).toEqual({ version: 4, bytes: new Uint8Array([192, 168, 1, 10]) });
+  });
+
+  test('should parse compressed and IPv4-embedded IPv6 addresses', () => {
+    expect(parseIP('::1').bytes[15]).toBe(1);
+    expect(parseIP('2001:db8::ff').bytes.slice(0, 4)).toEqual(new Uint8Array([0x20, 0x01, 0x0d, 0xb8]));
+    expect(Array.from(parseIP('::ffff:127.0.0.1').bytes.slice(10))).toEqual([255, 255, 127, 0, 0, 1]);
+  });
+
+  test('should reject malformed addresses', () => {
+    expect(parseIP('256.1.1.1')).toBeNull();
+    expect(parseIP('1.2.3')).toBeNull();
+    expect(parseIP('1.2.3.4.5')).toBeNull();
+    expect(parseIP('1..2.3')).toBeNull();
+    expect(parseIP('1.2.3.4 ')).toBeNull();
+    expect(parseIP('1:2:3:4:5:6:7:8:9')).toBeNull();
+    expect(parseIP('1::2::3')).toBeNull();
+    expect(parseIP('')).toBeNull();
+    expect(parseIP(null)).toBeNull();
+  });
+});
+
+describe('parseCIDR', () => {
+  test('should clear host bits', () => {
+    const range = parseCIDR('10.1.2.3/8');
+    expect(range.prefixLength).toBe(8);
+    expect(Array.from(range.bytes)).toEqual([10, 0, 0, 0]);
+  });
+
+  test('should reject missing or out-of-range prefixes', () => {
+    expect(parseCIDR('10.0.0.1')).toBeNull();
+    expect(parseCIDR('10.0.0.0/33')).toBeNull();
+    expect(parseCIDR('2001:db8::/129')).toBeNull();
+  });
+});
+
+describe('integerInRange', () => {
+  test('should match IPv4 addresses with integer masks', () => {
+    const range = cidrToInteger('192.168.1.0/24');
+    expect(range).toEqual({ version: 4, network: 0xc0a80100, mask: 0xffffff00 });
+    expect(integerInRange(addressToInteger('192.168.1.0'), range)).toBe(true);
+    expect(integerInRange(addressToInteger('192.168.1.255'), range)).toBe(true);
+    expect(integerInRange(addressToInteger('192.168.2.0'), range)).toBe(false);
+  });
+
+  test('should parse IPv4 addresses directly to unsigned integers', () => {
+    expect(addressToInteger('255.255.255.255')).toEqual({ version: 4, value: 0xffffffff });
+    expect(addressToInteger('0.0.0.1')).toEqual({ version: 4, value: 1 });
+    expect(addressToInteger('1.2.3.256')).toBeNull();
+  });
+
+  test('should reuse parsed IPv6 addresses', () => {
+    const address = addressToInteger('2001:db8::42');
+    expect(addressToInteger('2001:db8::42')).toBe(address);
+    expect(address.value).toBe(0x20010db8000000000000000000000042n);
+  });
+
+  test('should match IPv6 addresses with BigInt masks', () => {
+    const range = cidrToInteger('2001:db8::/32');
+    expect(integerInRange(addressToInteger('2001:db8::1'), range)).toBe(true);
+    expect(integerInRange(addressToInteger('2001:db9::1'), range)).toBe(false);
+  });
+
+  test('should handle /0 and host-length prefixes', () => {
+    expect(integerInRange(addressToInteger('255.255.255.255'), cidrToInteger('0.0.0.0/0'))).toBe(true);
+    expect(integerInRange(addressToInteger('10.0.0.1'), cidrToInteger('10.0.0.1/32'))).toBe(true);
+    expect(integerInRange(addressToInteger('10.0.0.2'), cidrToInteger('10.0.0.1/32'))).toBe(false);
+  });
+
+  test('should memoize parsed ranges', () => {
+    const range = cidrToInteger('172.16.0.0/12');
+    expect(cidrToInteger('172.16.0.0/12')).toBe(range);
+    expect(Object.isFrozen(range)).toBe(true);
+    expect(cidrToInteger('bad')).toBeNull();
+  });
+
+  test('should not match across address families', () => {
+    expect(integerInRange(addressToInteger('::ffff:10.0.0.1'), cidrToInteger('10.0.0.0/8'))).toBe(false);
+  });
+});
+
+describe('CIDRTrie', () => {
+  let trie;
+
+  beforeEach(() => {
+    trie = new CIDRTrie();
+    trie.insert('10.0.0.0/8', 'wide');
+    trie.insert('10.1.0.0/16', 'medium');
+    trie.insert('10.1.2.0/24', 'narrow');
+    trie.insert('192.168.1.0/24', 'lan');
+    trie.insert('2001:db8::/32', 'v6');
+    trie.insert('2001:db8:bad::/48', 'v6-narrow');
+  });
+
+  test('should return the longest matching prefix', () => {
+    expect(trie.lookup('10.9.9.9')).toBe('wide');
+    expect(trie.lookup('10.1.9.9')).toBe('medium');
+    expect(trie.lookup('10.1.2.3')).toBe('narrow');
+    expect(trie.lookup('2001:db8::1')).toBe('v6');
+    expect(trie.lookup('2001:db8:bad::1')).toBe('v6-narrow');
+  });
+
+  test('should match range boundaries', () => {
+    expect(trie.lookup('192.168.1.0')).toBe('lan');
+    expect(trie.lookup('192.168.1.255')).toBe('lan');
+    expect(trie.lookup('192.168.2.0')).toBeUndefined();
+  });
+
+  test('should keep IPv4 and IPv6 ranges separate', () => {
+    expect(trie.lookup('::ffff:10.0.0.1')).toBeUndefined();
+  });
+
+  test('should support a default route', () => {
+    trie.insert('0.0.0.0/0', 'default');
+    expect(trie.lookup('8.8.8.8')).toBe('default');
+    expect(trie.lookup('10.1.2.3')).toBe('narrow');
+  });
+
+  test('should replace the value of an identical range', () => {
+    trie.insert('10.1.2.99/24', 'replaced');
+    expect(trie.lookup('10.1.2.3')).toBe('replaced');
+    expect(trie.size).toBe(6);
+  });
+
+  test('should only allocate slots that are in use', () => {
+    expect(trie.roots[4].size).toBe(2);
+    expect(trie.roots[6].size).toBe(1);
+    trie.insert('172.16.0.0/12', 'private');
+    expect(trie.roots[4].get(172).child.size).toBe(16);
+  });
+
+  test('should ignore invalid ranges and addresses', () => {
+    expect(trie.insert('not-a-cidr', 'x')).toBe(false);
+    expect(trie.lookup('not-an-ip')).toBeUndefined();
+  });
+
+  test('should cache lookup results', () => {
+    expect(trie.lookup('10.1.2.3')).toBe('narrow');
+    expect(trie.lookup('8.8.8.8')).toBeUndefined();
+    expect(trie.cache.size).toBe(2);
+    expect(trie.lookup('10.1.2.3')).toBe('narrow');
+    expect(trie.cache.size).toBe(2);
+  });
+
+  test('should invalidate cached results on insert', () => {
+    expect(trie.lookup('10.1.2.200')).toBe('narrow');
+    trie.insert('10.1.2.128/25', 'narrower');
+    expect(trie.lookup('10.1.2.200')).toBe('narrower');
+  });
+
+  test('should evict least recently used results when cache is full', () => {
+    const small = new CIDRTrie({ cacheSize: 2 });
+    small.insert('10.0.0.0/8', 'wide');
+    small.lookup('10.0.0.1');
+    small.lookup('10.0.0.2');
+    small.lookup('10.0.0.1');
+    small.lookup('10.0.0.3');
+    expect(Array.from(small.cache.keys())).toEqual(['10.0.0.1', '10.0.0.3']);
+  });
+
+  test('should not cache when cacheSize is 0', () => {
+    const uncached = new CIDRTrie({ cacheSize: 0 });
+    uncached.insert('10.0.0.0/8', 'wide');
+    expect(uncached.lookup('10.0.0.1')).toBe('wide');
+    expect(uncached.cache.size).toBe(0);
+  });
+
+  test('should empty the trie on clear', () => {
+    trie.clear();
+    expect(trie.size).toBe(0);
+    expect(trie.lookup('10.1.2.3')).toBeUndefined();
+  });
+});
@@ -57,4 +57,9 @@ describe('ClientIdentifier', () => {
     expect(identity.valid).toBe(true);
     expect(identity.clientName).toBe('client1');
   });
+
+  test('should use first X-Forwarded-For address', () => {
+    expect(clientIdentifier._extractClientIP({ headers: { 'x-forwarded-for': '203.0.113.5' } })).toBe('203.0.113.5');
+    expect(clientIdentifier._extractClientIP({ headers: { 'x-forwarded-for': ' 203.0.113.5 , 10.0.0.1' } })).toBe('203.0.113.5');
+  });
 });
@@ -12,6 +12,7 @@
  * - Request count tracking
  */
 
+import { jest } from '@jest/globals';
 import IPAllowBlockManager, { IPListAction } from '../../src/ipAllowBlockManager.js';
 import fs from 'fs';
 import path from 'path';
@@ -398,6 +399,17 @@ describe('IPAllowBlockManager', () => {
       expect(success).toBe(false);
     });
 
+    test('should stop matching a removed CIDR range', () => {
+      expect(ipAllowBlockManager.isAllowlisted('192.168.1.50')).toBe(true);
+
+      const success = ipAllowBlockManager.removeFromAllowlist('192.168.1.0/24');
+      expect(success).toBe(true);
+
+      // Cached lookup result must be dropped along with the rebuilt trie
+      expect(ipAllowBlockManager.isAllowlisted('192.168.1.50')).toBe(false);
+      expect(ipAllowBlockManager.isAllowlisted('2001:db8::1234')).toBe(true);
+    });
+
     test('should persist allowlist removals to file', () => {
       ipAllowBlockManager.removeFromAllowlist('172.16.0.50');
       
@@ -420,6 +432,17 @@ describe('IPAllowBlockManager', () => {
       expect(success).toBe(false);
     });
 
+    test('should stop matching a removed CIDR range', () => {
+      expect(ipAllowBlockManager.isBlocklisted('10.0.5.100')).toBe(true);
+
+      const success = ipAllowBlockManager.removeFromBlocklist('10.0.0.0/8');
+      expect(success).toBe(true);
+
+      // Cached lookup result must be dropped along with the rebuilt trie
+      expect(ipAllowBlockManager.isBlocklisted('10.0.5.100')).toBe(false);
+      expect(ipAllowBlockManager.isBlocklisted('185.220.101.5')).toBe(true);
+    });
+
     test('should persist blocklist removals to file', () => {
       ipAllowBlockManager.removeFromBlocklist('192.168.1.100');
       
@@ -574,6 +597,38 @@ describe('IPAllowBlockManager', () => {
       expect(ipAllowBlockManager.isAllowlisted('123.45.67.89')).toBe(false);
     });
 
+    test('should still match CIDR ranges the trie cannot index', () => {
+      jest.spyOn(ipAllowBlockManager.blocklistTrie, 'insert').mockReturnValue(false);
+      const warnSpy = jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+      expect(ipAllowBlockManager.addToBlocklist('203.0.113.0/24', 'Unindexed range')).toBe(true);
+
+      expect(warnSpy).toHaveBeenCalledWith(expect.stringContaining('203.0.113.0/24'));
+      expect(ipAllowBlockManager.isBlocklisted('203.0.113.7')).toBe(true);
+      expect(ipAllowBlockManager.isBlocklisted('203.0.114.7')).toBe(false);
+
+      warnSpy.mockRestore();
+    });
+
+    test('should prefer a more specific unindexed range over a broader trie range', () => {
+      const trie = ipAllowBlockManager.blocklistTrie;
+      const insert = trie.insert.bind(trie);
+      jest.spyOn(trie, 'insert').mockImplementation((cidr, value) => (cidr === '10.1.0.0/16' ? false : insert(cidr, value)));
+      const warnSpy = jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+      ipAllowBlockManager.addToBlocklist('10.1.0.0/16', 'Unindexed subnet of 10.0.0.0/8');
+
+      expect(ipAllowBlockManager.isBlocklisted('10.1.2.3')).toBe(true);
+      expect(ipAllowBlockManager.blocklist.get('10.1.0.0/16').requestCount).toBe(1);
+      expect(ipAllowBlockManager.blocklist.get('10.0.0.0/8').requestCount).toBe(50);
+
+      // Outside the specific range the trie match still applies
+      expect(ipAllowBlockManager.isBlocklisted('10.2.0.1')).toBe(true);
+      expect(ipAllowBlockManager.blocklist.get('10.0.0.0/8').requestCount).toBe(51);
+
+      warnSpy.mockRestore();
+    });
+
     test('should handle very large CIDR ranges', () => {
       ipAllowBlockManager.addToAllowlist('0.0.0.0/0', 'All IPv4');
       
@@ -10,6 +10,7 @@
  * - File operations (load/save)
  */
 
+import { jest } from '@jest/globals';
 import IPManager from '../../src/ipManager.js';
 import fs from 'fs';
 import path from 'path';
@@ -82,6 +83,23 @@ describe('IPManager', () => {
       expect(stats.cidr.totalRanges).toBe(0);
     });
 
+    test('should skip malformed CIDR ranges', () => {
+      fs.appendFileSync(testCidrFile, '\nTest Client A,not-a-cidr,1\nTest Client B,10.0.0.0/99,1', 'utf-8');
+      const errorSpy = jest.spyOn(console, 'error').mockImplementation(() => {});
+
+      const manager = new IPManager('test_fixtures/test_cidr.csv', 'test_fixtures/test_learned_ips.csv');
+      const stats = manager.getStatistics();
+      expect(stats.cidr.totalRanges).toBe(4);
+
+      // One aggregated message, no per-row errors
+      expect(errorSpy).toHaveBeenCalledTimes(1);
+      expect(errorSpy.mock.calls[0][0]).toContain('Skipped 2 invalid CIDR range(s)');
+      expect(errorSpy.mock.calls[0][0]).toContain('not-a-cidr');
+      expect(errorSpy.mock.calls[0][0]).toContain('10.0.0.0/99');
+
+      errorSpy.mockRestore();
+    });
+
     test('should create learned IPs file if missing', () => {
       const newLearnedFile = path.join(fixturesDir, 'new_learned.csv');
       // eslint-disable-next-line no-new
@@ -363,6 +381,15 @@ describe('IPManager', () => {
       expect(stats.learned.totalIPs).toBe(3); // Was 2, now 3
     });
 
+    test('should not match IPv4-mapped IPv6 address against IPv4 CIDR', () => {
+      const manager = new IPManager('test_fixtures/test_cidr.csv', 'test_fixtures/test_learned_ips.csv');
+      manager.processIP('Test Client A', '::ffff:192.168.1.50');
+
+      const stats = manager.getStatistics();
+      expect(stats.cidr.byClient['Test Client A'].requests).toBe(15); // Unchanged
+      expect(stats.learned.totalIPs).toBe(3); // Was 2, now 3
+    });
+
     test('should handle compressed IPv6 notation', () => {
       const manager = new IPManager('test_fixtures/test_cidr.csv', 'test_fixtures/test_learned_ips.csv');
       manager.processIP('Test Client C', '2001:db8::');